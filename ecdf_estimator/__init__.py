@@ -2,3 +2,4 @@ from .objective_function import *
 from .output import *
 from .select_bins import *
 from .utils import *
+from .utils_numba import *
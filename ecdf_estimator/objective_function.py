@@ -1,5 +1,6 @@
 import numpy as np
 from inspect import signature
+import itertools as it
 import ecdf_estimator.utils as ecdf_aux
 
 
@@ -18,11 +19,13 @@ class standard:
     ## \private
     self.bins           = bins
     ## \private
+    self.bins_array     = np.ascontiguousarray(bins, dtype=np.float64)
+    ## \private
     self.distance_fct   = distance_fct
     ## \private
     self.subset_sizes   = subset_sizes
     ## \private
-    self.subset_indices = [ sum(subset_sizes[:i]) for i in range(len(subset_sizes)+1) ]
+    self.subset_indices = [0] + list(it.accumulate(subset_sizes))
     ## \private
     self.compare_all    = compare_all
     ## \private
@@ -33,6 +36,8 @@ class standard:
     ## \private
     self.covar_matrix   = ecdf_aux.covariance_of_ecdf_vectors(self.ecdf_list)
     ## \private
+    self.covar_factor   = ecdf_aux.covariance_factorization(self.covar_matrix)
+    ## \private
     self.error_printed  = False
 
   ## \private
@@ -60,12 +65,9 @@ class standard:
     end_index_list = [len(dataset)] + [ self.subset_indices[index+1] for index in comparison_ind ]
 
     distance_list = ecdf_aux.create_distance_matrix(
-      dataset_list, self.distance_fct, start_index_list, end_index_list )
-
-    while isinstance(distance_list[0], list):
-      distance_list = [item for sublist in distance_list for item in sublist]
+      dataset_list, self.distance_fct, start_index_list, end_index_list, flat=True )
 
-    return ecdf_aux.empirical_cumulative_distribution_vector(distance_list, self.bins)
+    return ecdf_aux.empirical_cumulative_distribution_vector(distance_list, self.bins_array)
 
   ## \private
   def evaluate( self, dataset ):
@@ -85,6 +87,8 @@ class bootstrap:
     ## \private
     self.bins           = bins
     ## \private
+    self.bins_array     = np.ascontiguousarray(bins, dtype=np.float64)
+    ## \private
     self.distance_fct   = distance_fct
     ## \private
     self.n_elements_a   = n_elements_a
@@ -100,6 +104,8 @@ class bootstrap:
     ## \private
     self.covar_matrix   = ecdf_aux.covariance_of_ecdf_vectors(self.ecdf_list)
     ## \private
+    self.covar_factor   = ecdf_aux.covariance_factorization(self.covar_matrix)
+    ## \private
     self.error_printed  = False
 
   ## \private
@@ -109,8 +115,8 @@ class bootstrap:
     
     comparison_set = [ dataset[i] for i in np.random.randint(len(dataset), size=self.n_elements_b) ]
     dataset_list = [dataset, comparison_set]
-    distance_list  = ecdf_aux.create_distance_matrix(dataset_list, self.distance_fct)
-    return ecdf_aux.empirical_cumulative_distribution_vector(distance_list, self.bins)
+    distance_list  = ecdf_aux.create_distance_matrix(dataset_list, self.distance_fct, flat=True)
+    return ecdf_aux.empirical_cumulative_distribution_vector(distance_list, self.bins_array)
 
   ## \private
   def evaluate( self, dataset ):
@@ -147,11 +153,12 @@ class multiple:
     ## \private
     self.covar_matrix   = ecdf_aux.covariance_of_ecdf_vectors(self.ecdf_list)
     ## \private
+    self.covar_factor   = ecdf_aux.covariance_factorization(self.covar_matrix)
+    ## \private
     self.error_printed  = False
 
   ## \private
   def evaluate( self, dataset ):
     vector = [ obj_fun.evaluate_ecdf(dataset[i]) for i,obj_fun in enumerate(self.obj_fun_list) ]
-    while isinstance(vector[0], list):
-      vector = [item for sublist in vector for item in sublist]
+    vector = np.concatenate( [ np.ravel(entry) for entry in vector ] )
     return ecdf_aux.evaluate_from_empirical_cumulative_distribution_functions( self, vector )
@@ -40,8 +40,8 @@ def plot_mean_vector( estimator, plotter=plt, plot_options="g." ):
 #  \param   plot_options   String describing the options for plotting.
 #  \retval  plotter        Python object to whhich the plot has been added.
 def plot_chi2_test( estimator, plotter=plt, plot_options="r-" ):
-  n_logl = [ ecdf_aux.evaluate_from_empirical_cumulative_distribution_functions(estimator, vector) \
-             for vector in np.transpose(estimator.ecdf_list) ]
+  n_logl = ecdf_aux.evaluate_from_empirical_cumulative_distribution_functions_batch(
+             estimator, estimator.ecdf_list )
   khi, bins = np.histogram( n_logl )
   khi_n = [ x / sum(khi) / (bins[1] - bins[0]) for x in khi ]
   plotter.hist(bins[:-1], bins, weights=khi_n)
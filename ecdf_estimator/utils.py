@@ -1,7 +1,93 @@
 import numpy as np
+import os
+import multiprocessing
 from inspect import signature
+from concurrent.futures import ProcessPoolExecutor
+from scipy.spatial.distance import cdist
+from scipy.linalg import cho_factor, cho_solve
 import itertools as it
 import collections.abc
+import ecdf_estimator.utils_numba as ecdf_numba
+
+
+## \brief   Choose the multiprocessing context for the worker pools.
+#
+#  The fork start method shares the dataset copy-on-write and supports non-picklable distance
+#  functions, but forking after numba's parallel runtime has started its threads may deadlock at
+#  interpreter shutdown. Once a compiled kernel has been handed out, spawn is used instead.
+#
+#  \retval  context        Multiprocessing context the pools are created with.
+def _pool_context():
+  if 'fork' in multiprocessing.get_all_start_methods() \
+    and not ecdf_numba.parallel_runtime_used():
+    return multiprocessing.get_context('fork')
+  return multiprocessing.get_context('spawn')
+
+
+# Context shared with worker processes of the parallel subset-pair loop. It is set once per pool
+# via the initializer, so the dataset is not pickled again for every dispatched pair.
+_pair_worker_context = None
+
+
+## \brief   Store the shared context in a worker process of the parallel subset-pair loop.
+#
+#  \param   dataset        Whole dataset, whose subsets are compared to one another.
+#  \param   bins           List of bins.
+#  \param   distance_fct   Function generating a generalized distance between members of dataset.
+def _init_pair_worker( dataset, bins, distance_fct ):
+  global _pair_worker_context
+  _pair_worker_context = (dataset, bins, distance_fct)
+
+
+## \brief   Evaluate the ecdf vector of one subset combination in a worker process.
+#
+#  \param   bounds         Tuple of starting and ending indices of the compared subsets.
+#  \retval  ecdf_vector    ecdf vector of the respective subset combination.
+def _pair_ecdf_task( bounds ):
+  dataset, bins, distance_fct = _pair_worker_context
+  return _pair_ecdf( dataset, bins, distance_fct, bounds[0], bounds[1] )
+
+
+## \brief   Evaluate the ecdf vector of one subset combination.
+#
+#  \param   dataset            Whole dataset, whose subsets are compared to one another.
+#  \param   bins               List of bins.
+#  \param   distance_fct       Function generating a generalized distance between members.
+#  \param   start_index_list   Starting indices of the compared subsets.
+#  \param   end_index_list     Ending indices of the compared subsets.
+#  \retval  ecdf_vector        ecdf vector of the respective subset combination.
+def _pair_ecdf( dataset, bins, distance_fct, start_index_list, end_index_list ):
+  dataset_list = [ dataset[start:end] for start, end in zip(start_index_list, end_index_list) ]
+  bins_arr     = np.asarray(bins, dtype=np.float64)
+
+  if len(dataset_list) == 2:
+    ecdf_kernel = ecdf_numba.ecdf_kernel(distance_fct)
+    if ecdf_kernel is not None and np.all(np.diff(bins_arr) >= 0.):
+      set_a, set_b = _stack_subset_pair(dataset_list, start_index_list, end_index_list)
+      return ecdf_kernel(set_a, set_b, bins_arr)
+
+  distance_list = create_distance_matrix(
+    dataset_list, distance_fct, start_index_list, end_index_list, flat=True )
+  return empirical_cumulative_distribution_vector( distance_list, bins_arr )
+
+
+## \brief   Stack two (possibly sliced) datasets into 2D arrays for pairwise kernels.
+#
+#  \param   dataset_list       List of the two datasets which are compared to each other.
+#  \param   start_index_list   Starting indices of the datasets.
+#  \param   end_index_list     Ending indices of the datasets.
+#  \param   dtype              Floating point type of the stacked arrays. Defaults to float64.
+#  \retval  set_a, set_b       Subsets as 2D arrays, 1D data is stacked as column vectors.
+def _stack_subset_pair( dataset_list, start_index_list, end_index_list, dtype=np.float64 ):
+  if len(dataset_list[0]) == len(dataset_list[1]):
+    set_a, set_b = dataset_list[0], dataset_list[1]
+  else:
+    set_a = dataset_list[0][start_index_list[0]:end_index_list[0]]
+    set_b = dataset_list[1][start_index_list[1]:end_index_list[1]]
+  set_a, set_b = np.asarray(set_a, dtype=dtype), np.asarray(set_b, dtype=dtype)
+  if set_a.ndim == 1:  set_a = set_a[:,None]
+  if set_b.ndim == 1:  set_b = set_b[:,None]
+  return set_a, set_b
 
 
 ## \brief   Create list of ECDF values.
@@ -14,8 +100,19 @@ import collections.abc
 #  \param   bins           List of bins.
 #  \retval  ecdf_list      Resulting list of amout of distances that are smaller than resp. bins.
 def empirical_cumulative_distribution_vector( distance_list, bins ):
-  return [ np.sum( [distance < basket for distance in distance_list] ) / len(distance_list) \
-           for basket in bins ]  # np.sum appears to be much faster than Python's standard sum!
+  distances = np.asarray(distance_list, dtype=np.float64).ravel()
+  bins_arr  = np.asarray(bins, dtype=np.float64)
+  if bins_arr.size > 0 and np.all( np.diff(bins_arr) >= 0. ):
+    merge_kernel = ecdf_numba.merge_ecdf_kernel()
+    if merge_kernel is not None:
+      ecdf_vector = np.empty( bins_arr.size )
+      merge_kernel( np.sort(distances), bins_arr, ecdf_vector )
+      return ecdf_vector
+    indices = np.digitize(distances, bins_arr, right=False)
+    counts  = np.bincount(indices, minlength=bins_arr.size+1)
+    return np.cumsum(counts)[:bins_arr.size] / distances.size
+  distances = np.sort(distances)
+  return np.searchsorted( distances, bins_arr, side='left' ) / distances.size
 
 
 ## \brief   Assemble list of (generalized) distances between elemenst of datasets.
@@ -28,8 +125,16 @@ def empirical_cumulative_distribution_vector( distance_list, bins ):
 #  \param   distance_fct       Generalized distance function among several datasets.
 #  \param   start_index_list   Starting indices of the datasets. Defaults to None.
 #  \param   end_index_list     Ending indices of the datasets. Defaults to None.
+#  \param   vectorized         If True, evaluate the Euclidean distance for all pairs at once via
+#                              scipy's cdist. If a callable, it is invoked with the two stacked
+#                              subsets and must return the full distance matrix. Defaults to False.
+#  \param   flat               If True, return the distances as flat 1D float ndarray instead of
+#                              a (possibly nested) matrix. Defaults to False.
+#  \param   dtype              Floating point type of the returned ndarray paths. float32 halves
+#                              the memory traffic of large matrices. Defaults to float64.
 #  \retval  distance_mat       Matrix of generalized distances.
-def create_distance_matrix(dataset_list, distance_fct, start_index_list=None, end_index_list=None):
+def create_distance_matrix(dataset_list, distance_fct, start_index_list=None, end_index_list=None,
+  vectorized=False, flat=False, dtype=np.float64):
   if start_index_list is None:  start_index_list = [0] * len(dataset_list)
   if end_index_list is None:    
     if isinstance(dataset_list[0], collections.abc.Sequence):
@@ -48,15 +153,34 @@ def create_distance_matrix(dataset_list, distance_fct, start_index_list=None, en
   for k in range(0,len(start_index_list)):
     if end_index_list[k] < start_index_list[k]: raise Exception("Invalid subset indices chosen.")
 
-  if n_params == 1:
-    return [distance_fct(dataset_list[0][i]) for i in range(start_index_list[0], end_index_list[0])]
-
-  if (len(dataset_list[0]) == len(dataset_list[1])):
-    return [distance_fct(*item) for item in it.product(*dataset_list)]
+  if vectorized:
+    if n_params != 2 or len(dataset_list) != 2:
+      raise Exception("Vectorized distance evaluation requires two datasets and a binary function.")
+    set_a, set_b = _stack_subset_pair(dataset_list, start_index_list, end_index_list, dtype)
+    if callable(vectorized):  distance_mat = np.asarray( vectorized(set_a, set_b) )
+    else:                     distance_mat = cdist(set_a, set_b)
+    distance_mat = distance_mat.astype(dtype, copy=False)
+    return distance_mat.ravel() if flat else distance_mat
+
+  kernel = ecdf_numba.pairwise_kernel(distance_fct)
+  if kernel is not None and n_params == 2 and len(dataset_list) == 2:
+    set_a, set_b = _stack_subset_pair(dataset_list, start_index_list, end_index_list, dtype)
+    distance_mat = np.empty( (set_a.shape[0], set_b.shape[0]), dtype=dtype )
+    kernel(set_a, set_b, distance_mat)
+    return distance_mat.ravel() if flat else distance_mat
 
-  sets = [dataset_list[i][start_index_list[i]:end_index_list[i]] for i in range(len(dataset_list))]
+  if n_params == 1:
+    subset = dataset_list[0][start_index_list[0]:end_index_list[0]]
+    distance_mat = [distance_fct(item) for item in subset]
+  elif (len(dataset_list[0]) == len(dataset_list[1])):
+    distance_mat = [distance_fct(*item) for item in it.product(*dataset_list)]
+  else:
+    sets = [dataset_list[i][start_index_list[i]:end_index_list[i]] \
+            for i in range(len(dataset_list))]
+    distance_mat = [distance_fct(*item) for item in it.product(*sets)]
 
-  return [distance_fct(*item) for item in it.product(*sets)]
+  if flat:  return np.asarray(distance_mat, dtype=dtype).ravel()
+  return distance_mat
 
 
 
@@ -75,11 +199,12 @@ def create_distance_matrix(dataset_list, distance_fct, start_index_list=None, en
 #  \param   distance_fct   Function generating a generalized distance between members of dataset.
 #  \param   subset_indices List of starting (and ending) indices of disjointly subdivided dataset.
 #  \param   compare_all    If False, only subsets of different sizes are compared. Deafault: True
+#  \param   n_jobs         Number of worker processes for the subset-pair loop. None (default)
+#                          computes sequentially, -1 uses all available cores.
 #  \retval  ecdf_list      ecdf vector enlisting values for subset combinations.
 def empirical_cumulative_distribution_vector_list(
-  dataset, bins, distance_fct, subset_indices, compare_all=True ):
+  dataset, bins, distance_fct, subset_indices, compare_all=True, n_jobs=None ):
   n_params = len(signature(distance_fct).parameters)
-  matrix = []
 
   if not all(subset_indices[i] <= subset_indices[i+1] for i in range(len(subset_indices)-1)):
     raise Exception("Subset indices are out of order.")
@@ -87,32 +212,138 @@ def empirical_cumulative_distribution_vector_list(
     raise Exception("Not all elements of the dataset are distributed into subsets.")
 
   if n_params == 1:
+    matrix = np.empty( (len(bins), len(subset_indices)-1) )
     for i in range(len(subset_indices)-1):
       distance_list = create_distance_matrix(
-        [dataset], distance_fct, [subset_indices[i]], [subset_indices[i+1]] )
-      
-      while isinstance(distance_list[0], list):
-        distance_list = [item for sublist in distance_list for item in sublist]
-      matrix.append( empirical_cumulative_distribution_vector(distance_list, bins) )
+        [dataset], distance_fct, [subset_indices[i]], [subset_indices[i+1]], flat=True )
+      matrix[:,i] = empirical_cumulative_distribution_vector(distance_list, bins)
 
-    return np.transpose(matrix)
+    return matrix
   # end: if n_params == 1
 
-  combinations = it.combinations(list(range(0,len(subset_indices)-1)), n_params)
-  dataset_list = []
+  combinations = list( it.combinations(list(range(0,len(subset_indices)-1)), n_params) )
+  bounds = [ ( [subset_indices[index] for index in combo],
+               [subset_indices[index+1] for index in combo] ) for combo in combinations ]
+  matrix = np.empty( (len(bins), len(combinations)) )
 
-  for combo in combinations:
-    dataset_list = [ dataset[subset_indices[combo[i]]:subset_indices[combo[i]+1]] \
-                     for i in range(len(combo)) ]
-    start_index_list = [subset_indices[index] for index in combo]
-    end_index_list = [subset_indices[index+1] for index in combo]
-    
-    distance_list = create_distance_matrix(
-      dataset_list, distance_fct, start_index_list, end_index_list )
-    matrix.append(empirical_cumulative_distribution_vector( distance_list, bins ))
-    dataset_list = []
+  if n_jobs is not None and n_jobs != 1 and len(bounds) > 1:
+    with ProcessPoolExecutor( max_workers=(n_jobs if n_jobs > 0 else None),
+      mp_context=_pool_context(),
+      initializer=_init_pair_worker, initargs=(dataset, bins, distance_fct) ) as executor:
+      for column, ecdf_vector in enumerate( executor.map(_pair_ecdf_task, bounds) ):
+        matrix[:,column] = ecdf_vector
+    return matrix
 
-  return np.transpose(matrix)
+  for column, (start_index_list, end_index_list) in enumerate(bounds):
+    matrix[:,column] = _pair_ecdf(
+      dataset, bins, distance_fct, start_index_list, end_index_list )
+
+  return matrix
+
+
+## \brief   Draw bootstrap samples from a flat distance matrix and evaluate their ecdf vectors.
+#
+#  Per sample, the first subset is drawn uniformly over all distances and the second one from the
+#  complement of the first draw. The ecdf values of a whole batch of samples are obtained from a
+#  single broadcasted comparison against the bins.
+#
+#  \param   distance_matrix  Raveled matrix of distances between the dataset members.
+#  \param   bins_arr         Bins as 1D array.
+#  \param   n_elements_a     Number of elements in first (smaller) subset.
+#  \param   n_elements_b     Number of elements in second (larger) subset.
+#  \param   n_samples        Number of perturbatins of the datasets.
+#  \param   rng              Random number generator used for the resampling.
+#  \retval  sample_matrix    Matrix of shape (n_samples, n_bins) of ecdf vectors.
+def _bootstrap_ecdf_samples(
+  distance_matrix, bins_arr, n_elements_a, n_elements_b, n_samples, rng ):
+  n_dist    = distance_matrix.size
+  all_index = np.arange(n_dist)
+  matrix    = np.empty( (n_samples, bins_arr.size) )
+  batch_size = 64
+
+  select  = np.empty( (min(batch_size, n_samples), n_elements_a + n_elements_b), dtype=np.intp )
+  samples = np.empty( select.shape, dtype=distance_matrix.dtype )
+  mask    = np.empty( n_dist, dtype=bool )
+
+  for start in range(0, n_samples, batch_size):
+    batch = min(batch_size, n_samples - start)
+    for sample in range(batch):
+      select_a = rng.integers(n_dist, size=n_elements_a)
+      mask.fill(True)
+      mask[select_a] = False
+      indices  = all_index[mask]
+      select[sample,:n_elements_a] = select_a
+      select[sample,n_elements_a:] = indices[rng.integers(indices.size, size=n_elements_b)]
+
+    np.take( distance_matrix, select[:batch], out=samples[:batch] )
+    matrix[start:start+batch,:] = ( samples[:batch,:,None] < bins_arr[None,None,:] ).mean(axis=1)
+
+  return matrix
+
+
+## \brief   Same as _bootstrap_ecdf_samples, but evaluated on the GPU via cupy.
+#
+#  The flat distance matrix and the bins are transferred to the device once; index generation,
+#  gathering, and the broadcasted comparison against the bins all run there. The draw semantics
+#  match the CPU path: the second subset is drawn from the complement of the first draw, realized
+#  by redrawing colliding indices (rejection sampling).
+#
+#  \param   distance_matrix  Raveled matrix of distances between the dataset members.
+#  \param   bins_arr         Bins as 1D array.
+#  \param   n_elements_a     Number of elements in first (smaller) subset.
+#  \param   n_elements_b     Number of elements in second (larger) subset.
+#  \param   n_samples        Number of perturbatins of the datasets.
+#  \retval  sample_matrix    Matrix of shape (n_samples, n_bins) of ecdf vectors on the host.
+def _bootstrap_ecdf_samples_gpu(
+  distance_matrix, bins_arr, n_elements_a, n_elements_b, n_samples ):
+  import cupy as cp
+
+  flat     = cp.asarray(distance_matrix)
+  bins_gpu = cp.asarray(bins_arr)
+  n_dist   = flat.size
+  matrix   = cp.empty( (n_samples, bins_gpu.size) )
+  batch_size = 256
+
+  for start in range(0, n_samples, batch_size):
+    batch    = min(batch_size, n_samples - start)
+    select_a = cp.random.randint(n_dist, size=(batch, n_elements_a))
+    select_b = cp.random.randint(n_dist, size=(batch, n_elements_b))
+    while True:
+      collision = ( select_b[:,:,None] == select_a[:,None,:] ).any(axis=2)
+      n_collision = int(collision.sum())
+      if n_collision == 0:  break
+      select_b[collision] = cp.random.randint(n_dist, size=n_collision)
+
+    samples = flat[ cp.concatenate((select_a, select_b), axis=1) ]
+    matrix[start:start+batch,:] = ( samples[:,:,None] < bins_gpu[None,None,:] ).mean(axis=1)
+
+  return cp.asnumpy(matrix)
+
+
+# Context shared with worker processes of the parallel bootstrap loop, set via the initializer.
+_bootstrap_worker_context = None
+
+
+## \brief   Store the shared context in a worker process of the parallel bootstrap loop.
+#
+#  \param   distance_matrix  Raveled matrix of distances between the dataset members.
+#  \param   bins_arr         Bins as 1D array.
+#  \param   n_elements_a     Number of elements in first (smaller) subset.
+#  \param   n_elements_b     Number of elements in second (larger) subset.
+def _init_bootstrap_worker( distance_matrix, bins_arr, n_elements_a, n_elements_b ):
+  global _bootstrap_worker_context
+  _bootstrap_worker_context = (distance_matrix, bins_arr, n_elements_a, n_elements_b)
+
+
+## \brief   Evaluate a chunk of bootstrap samples in a worker process.
+#
+#  \param   task           Tuple of the chunk's sample count and its random seed sequence.
+#  \retval  sample_matrix  Matrix of shape (chunk size, n_bins) of ecdf vectors.
+def _bootstrap_task( task ):
+  n_samples, seed = task
+  distance_matrix, bins_arr, n_elements_a, n_elements_b = _bootstrap_worker_context
+  return _bootstrap_ecdf_samples( distance_matrix, bins_arr, n_elements_a, n_elements_b,
+                                  n_samples, np.random.default_rng(seed) )
 
 
 ## \brief   Same as empirical_cumulative_distribution_vector_list, but for bootstrapping.
@@ -123,26 +354,47 @@ def empirical_cumulative_distribution_vector_list(
 #  \param   bins           List of bins.
 #  \param   distance_fct   Function generating a generalized distance between members of dataset.
 #  \param   n_samples      Number of perturbatins of the datasets.
+#  \param   n_jobs         Number of worker processes for the resampling loop. None (default)
+#                          computes sequentially, -1 uses all available cores.
+#  \param   dtype          Floating point type of the distance matrix. float32 halves the memory
+#                          traffic of the resampling stage. Defaults to float64.
+#  \param   use_gpu        If True, evaluate the resampling on the GPU via cupy. Falls back to the
+#                          CPU path with a warning if cupy is not installed. Defaults to False.
 #  \retval  ecdf_list      ecdf vector enlisting values for subset combinations.
 def empirical_cumulative_distribution_vector_list_bootstrap(
-  dataset, bins, distance_fct, n_elements_a, n_elements_b, n_samples ):
+  dataset, bins, distance_fct, n_elements_a, n_elements_b, n_samples, n_jobs=None,
+  dtype=np.float64, use_gpu=False ):
   n_params = len(signature(distance_fct).parameters)
   dataset_list = []
 
   if n_params == 2:
     dataset_list.append(dataset[0:n_elements_a])
     dataset_list.append(dataset[n_elements_a:n_elements_a+n_elements_b])
-    distance_matrix = np.array( create_distance_matrix(dataset_list, distance_fct) )
-
-    matrix = []
-    for _ in range(n_samples):
-      select_a = np.random.randint(len(distance_matrix), size=n_elements_a)
-      indices  = [ i for i in range(len(distance_matrix)) if i not in select_a ]
-      select_b = [ indices[x] for x in np.random.randint(len(indices), size=n_elements_b) ]
+    distance_matrix = create_distance_matrix(dataset_list, distance_fct, flat=True, dtype=dtype)
+    bins_arr = np.asarray(bins, dtype=dtype)
+
+    if use_gpu:
+      try:
+        return np.transpose( _bootstrap_ecdf_samples_gpu(
+          distance_matrix, bins_arr, n_elements_a, n_elements_b, n_samples ) )
+      except ImportError:
+        print("WARNING: cupy is not available. The bootstrap samples are evaluated on the CPU.")
+
+    if n_jobs is not None and n_jobs != 1 and n_samples > 1:
+      n_workers   = n_jobs if n_jobs > 0 else (os.cpu_count() or 1)
+      chunk_sizes = [ chunk.size for chunk in np.array_split(np.arange(n_samples), n_workers)
+                      if chunk.size > 0 ]
+      seeds = np.random.SeedSequence().spawn(len(chunk_sizes))
+      with ProcessPoolExecutor( max_workers=len(chunk_sizes),
+        mp_context=_pool_context(),
+        initializer=_init_bootstrap_worker,
+        initargs=(distance_matrix, bins_arr, n_elements_a, n_elements_b) ) as executor:
+        matrix = np.concatenate(
+          list( executor.map(_bootstrap_task, zip(chunk_sizes, seeds)) ) )
+    else:
+      matrix = _bootstrap_ecdf_samples( distance_matrix, bins_arr, n_elements_a, n_elements_b,
+                                        n_samples, np.random.default_rng() )
 
-      distance_list = [ distance_matrix[i] for sublist in [select_a, select_b] for i in sublist ]
-      matrix.append( empirical_cumulative_distribution_vector(distance_list, bins) )
-      
   return np.transpose(matrix)
 
 
@@ -151,7 +403,7 @@ def empirical_cumulative_distribution_vector_list_bootstrap(
 #  \param   ecdf_list      Usually the result of empirical_cumulative_distribution_vector_list.
 #  \retval  ecdf_means     Element-wise mean values of the ecdf vectors.
 def mean_of_ecdf_vectors( ecdf_vector_list ):
-  return [ np.mean(vector) for vector in ecdf_vector_list ]
+  return np.asarray( ecdf_vector_list ).mean(axis=1)
 
 
 ## \brief  Covariance matrix of ecdf vectors.
@@ -162,6 +414,20 @@ def covariance_of_ecdf_vectors( ecdf_vector_list ):
   return np.cov( ecdf_vector_list )
 
 
+## \brief  Cholesky factorization of a covariance matrix, or None if the matrix is singular.
+#
+#  The factorization is computed once per estimator, so that every evaluation of the target
+#  function only needs two triangular solves instead of a full linear solve.
+#
+#  \param   covar_matrix   Covariance matrix associated to the ecdf vectors.
+#  \retval  covar_factor   Factorization suitable for cho_solve, or None for singular matrices.
+def covariance_factorization( covar_matrix ):
+  try:
+    return cho_factor( covar_matrix, lower=True )
+  except np.linalg.LinAlgError:
+    return None
+
+
 ## \brief  Evaluate target/objective/cost function associated to estimator type from dataset.
 #
 #  Evaluate the negative log-likelihood in the way that is characterized by the estimator.
@@ -182,11 +448,32 @@ def evaluate( estimator, dataset ):
 #  \retval  target_val     The value of the target function.
 def evaluate_from_empirical_cumulative_distribution_functions( estimator, vector ):
   mean_deviation = np.subtract( estimator.mean_vector , vector )
+  if not hasattr(estimator, 'covar_factor'):
+    estimator.covar_factor = covariance_factorization( estimator.covar_matrix )
+  if estimator.covar_factor is not None:
+    return np.dot( mean_deviation , cho_solve(estimator.covar_factor, mean_deviation) )
   if not estimator.error_printed:
-    try:
-      x = np.linalg.solve(estimator.covar_matrix, mean_deviation)
-      return np.dot( mean_deviation , np.linalg.solve(estimator.covar_matrix, mean_deviation) )
-    except np.linalg.LinAlgError as error:
-      estimator.error_printed = True
-      print("WARNING: Covariance matrix is singular. CIL_estimator uses different topology.")
+    estimator.error_printed = True
+    print("WARNING: Covariance matrix is singular. CIL_estimator uses different topology.")
   return np.dot( mean_deviation , mean_deviation )
+
+
+## \brief  Evaluate the target function for a whole matrix of ecdf vectors at once.
+#
+#  Batch version of evaluate_from_empirical_cumulative_distribution_functions: all deviations from
+#  the mean vector are solved against the cached covariance factorization in one call, i.e. one set
+#  of triangular solves instead of one linear solve per ecdf vector.
+#
+#  \param   estimator      The estimator class defining the specifics of the target function.
+#  \param   matrix         Matrix whose columns are the ecdf vectors to be evaluated.
+#  \retval  target_vals    1D array holding the value of the target function per column.
+def evaluate_from_empirical_cumulative_distribution_functions_batch( estimator, matrix ):
+  deviation = np.asarray(estimator.mean_vector)[:,None] - np.asarray(matrix)
+  if not hasattr(estimator, 'covar_factor'):
+    estimator.covar_factor = covariance_factorization( estimator.covar_matrix )
+  if estimator.covar_factor is not None:
+    return np.einsum( 'ij,ij->j', deviation, cho_solve(estimator.covar_factor, deviation) )
+  if not estimator.error_printed:
+    estimator.error_printed = True
+    print("WARNING: Covariance matrix is singular. CIL_estimator uses different topology.")
+  return np.einsum( 'ij,ij->j', deviation, deviation )
@@ -0,0 +1,199 @@
+import math
+import numpy as np
+
+try:
+  from numba import njit, prange
+except ImportError:
+  njit, prange = None, None
+
+
+## \brief   Check whether the optional numba dependency is installed.
+#
+#  \retval  available      True if the compiled kernels of this module can be used.
+def available():
+  return njit is not None
+
+
+## \brief   Euclidean distance between two members of a dataset.
+#
+#  Members may be scalars or (small) vectors. Passing this function as distance_fct lets
+#  create_distance_matrix route the pairwise evaluation to a compiled kernel if numba is installed.
+#
+#  \param   point_a        First dataset member.
+#  \param   point_b        Second dataset member.
+#  \retval  distance       Euclidean distance between both members.
+def euclidean_distance( point_a, point_b ):
+  return math.sqrt( np.sum( np.square( np.subtract(point_a, point_b) ) ) )
+
+
+## \brief   L1 (cityblock) distance between two members of a dataset.
+#
+#  Members may be scalars or (small) vectors. Passing this function as distance_fct lets
+#  create_distance_matrix route the pairwise evaluation to a compiled kernel if numba is installed.
+#
+#  \param   point_a        First dataset member.
+#  \param   point_b        Second dataset member.
+#  \retval  distance       L1 distance between both members.
+def cityblock_distance( point_a, point_b ):
+  return np.sum( np.abs( np.subtract(point_a, point_b) ) )
+
+
+if njit is not None:
+  ## \brief   Compiled kernel filling the matrix of pairwise Euclidean distances.
+  #
+  #  \param   set_a          First subset as 2D array of shape (n_a, dim).
+  #  \param   set_b          Second subset as 2D array of shape (n_b, dim).
+  #  \param   out            Preallocated output matrix of shape (n_a, n_b).
+  @njit(parallel=True, fastmath=True)
+  def _pairwise_euclidean( set_a, set_b, out ):
+    for i in prange(set_a.shape[0]):
+      for j in range(set_b.shape[0]):
+        dist = 0.0
+        for k in range(set_a.shape[1]):
+          diff  = set_a[i,k] - set_b[j,k]
+          dist += diff * diff
+        out[i,j] = math.sqrt(dist)
+
+  ## \brief   Compiled kernel fusing Euclidean distance evaluation and ecdf binning.
+  #
+  #  The pairwise distances are never materialized: each distance is binned into the sorted bins
+  #  right away via a per-row histogram, which is reduced and accumulated at the end. This turns
+  #  the O(n_a * n_b) intermediate distance matrix into O(len(bins)) output memory.
+  #
+  #  \param   set_a          First subset as 2D array of shape (n_a, dim).
+  #  \param   set_b          Second subset as 2D array of shape (n_b, dim).
+  #  \param   bins           Sorted bins as 1D array.
+  #  \retval  ecdf_vector    Fraction of pairwise distances smaller than the respective bins.
+  @njit(parallel=True, fastmath=True)
+  def _ecdf_euclidean( set_a, set_b, bins ):
+    hist = np.zeros( (set_a.shape[0], bins.size + 1), dtype=np.int64 )
+    for i in prange(set_a.shape[0]):
+      for j in range(set_b.shape[0]):
+        dist = 0.0
+        for k in range(set_a.shape[1]):
+          diff  = set_a[i,k] - set_b[j,k]
+          dist += diff * diff
+        hist[i, np.searchsorted(bins, math.sqrt(dist), side='right')] += 1
+    counts = hist.sum(axis=0)
+    return np.cumsum(counts)[:bins.size] / (set_a.shape[0] * set_b.shape[0])
+
+  ## \brief   Compiled kernel filling the matrix of pairwise L1 distances.
+  #
+  #  \param   set_a          First subset as 2D array of shape (n_a, dim).
+  #  \param   set_b          Second subset as 2D array of shape (n_b, dim).
+  #  \param   out            Preallocated output matrix of shape (n_a, n_b).
+  @njit(parallel=True, fastmath=True)
+  def _pairwise_cityblock( set_a, set_b, out ):
+    for i in prange(set_a.shape[0]):
+      for j in range(set_b.shape[0]):
+        dist = 0.0
+        for k in range(set_a.shape[1]):
+          dist += abs(set_a[i,k] - set_b[j,k])
+        out[i,j] = dist
+
+  ## \brief   Compiled kernel fusing L1 distance evaluation and ecdf binning.
+  #
+  #  \param   set_a          First subset as 2D array of shape (n_a, dim).
+  #  \param   set_b          Second subset as 2D array of shape (n_b, dim).
+  #  \param   bins           Sorted bins as 1D array.
+  #  \retval  ecdf_vector    Fraction of pairwise distances smaller than the respective bins.
+  @njit(parallel=True, fastmath=True)
+  def _ecdf_cityblock( set_a, set_b, bins ):
+    hist = np.zeros( (set_a.shape[0], bins.size + 1), dtype=np.int64 )
+    for i in prange(set_a.shape[0]):
+      for j in range(set_b.shape[0]):
+        dist = 0.0
+        for k in range(set_a.shape[1]):
+          dist += abs(set_a[i,k] - set_b[j,k])
+        hist[i, np.searchsorted(bins, dist, side='right')] += 1
+    counts = hist.sum(axis=0)
+    return np.cumsum(counts)[:bins.size] / (set_a.shape[0] * set_b.shape[0])
+
+  ## \brief   Compiled kernel merging sorted distances and sorted bins into the ecdf vector.
+  #
+  #  One pointer walks the sorted distances, one the bins, so the ecdf is a single linear pass
+  #  with perfectly predictable branches and no per-bin binary search.
+  #
+  #  \param   sorted_distances  Distances as sorted 1D array.
+  #  \param   bins              Sorted bins as 1D array.
+  #  \param   out               Preallocated output vector of length bins.size.
+  @njit
+  def _merge_ecdf( sorted_distances, bins, out ):
+    index = 0
+    for b in range(bins.size):
+      while index < sorted_distances.size and sorted_distances[index] < bins[b]:
+        index += 1
+      out[b] = index / sorted_distances.size
+
+  _pairwise_kernels = { euclidean_distance: _pairwise_euclidean,
+                        cityblock_distance: _pairwise_cityblock }
+  _ecdf_kernels     = { euclidean_distance: _ecdf_euclidean,
+                        cityblock_distance: _ecdf_cityblock }
+else:
+  _merge_ecdf       = None
+  _pairwise_kernels = {}
+  _ecdf_kernels     = {}
+
+# True once a compiled parallel kernel has been handed out. Forking worker processes afterwards
+# may deadlock in numba's threading layer, so the pools switch to the spawn start method then.
+_parallel_runtime_used = False
+
+
+## \brief   Check whether a compiled parallel kernel may have been executed.
+#
+#  \retval  used           True if a kernel has been handed out by one of the accessors.
+def parallel_runtime_used():
+  return _parallel_runtime_used
+
+
+## \brief   Register a compiled pairwise kernel for a scalar distance function.
+#
+#  The kernel must accept two stacked subsets of shapes (n_a, dim) and (n_b, dim) and fill a
+#  preallocated (n_a, n_b) output matrix with the respective distances.
+#
+#  \param   distance_fct   Scalar distance function used by the caller.
+#  \param   kernel         Compiled pairwise kernel associated to the distance function.
+def register_pairwise_kernel( distance_fct, kernel ):
+  _pairwise_kernels[distance_fct] = kernel
+
+
+## \brief   Return the compiled pairwise kernel registered for a distance function.
+#
+#  \param   distance_fct   Scalar distance function used by the caller.
+#  \retval  kernel         Registered kernel, or None if there is none (or numba is missing).
+def pairwise_kernel( distance_fct ):
+  kernel = _pairwise_kernels.get(distance_fct)
+  if kernel is not None:
+    global _parallel_runtime_used
+    _parallel_runtime_used = True
+  return kernel
+
+
+## \brief   Return the compiled linear-merge ecdf kernel.
+#
+#  \retval  kernel         Merge kernel for sorted distances and bins, or None if numba is missing.
+def merge_ecdf_kernel():
+  return _merge_ecdf
+
+
+## \brief   Register a compiled fused ecdf kernel for a scalar distance function.
+#
+#  The kernel must accept two stacked subsets and a sorted 1D bins array, and return the ecdf
+#  vector of the pairwise distances without materializing the distance matrix.
+#
+#  \param   distance_fct   Scalar distance function used by the caller.
+#  \param   kernel         Compiled fused ecdf kernel associated to the distance function.
+def register_ecdf_kernel( distance_fct, kernel ):
+  _ecdf_kernels[distance_fct] = kernel
+
+
+## \brief   Return the compiled fused ecdf kernel registered for a distance function.
+#
+#  \param   distance_fct   Scalar distance function used by the caller.
+#  \retval  kernel         Registered kernel, or None if there is none (or numba is missing).
+def ecdf_kernel( distance_fct ):
+  kernel = _ecdf_kernels.get(distance_fct)
+  if kernel is not None:
+    global _parallel_runtime_used
+    _parallel_runtime_used = True
+  return kernel